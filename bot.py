@@ -5,7 +5,6 @@ from zoneinfo import ZoneInfo
 
 import discord
 from discord import app_commands
-from discord.ext import tasks
 from dotenv import load_dotenv
 import aiosqlite
 
@@ -18,52 +17,135 @@ UTC = ZoneInfo("UTC")  # Python 3.13 호환
 INTENTS = discord.Intents.default()
 INTENTS.message_content = True  # 메시지 콘텐츠 인텐트(필요 시)
 
+# 반복 알람 전송용(매 전송마다 새로 만들지 않도록 한 번만 생성)
+ALLOWED_EVERYONE = discord.AllowedMentions(everyone=True, users=False, roles=False)
+ALLOWED_USER = discord.AllowedMentions(everyone=False, users=True, roles=False)
+RECURRING_TEXT = "{} 알람(매일 {:02d}:{:02d}) : {}".format
+
+RETRY_DELAY = 30.0   # 전송 실패/예외 후 재시도 간격(초)
+MAX_SLEEP = 3600.0   # 스케줄러 최대 대기(초) — 시계 보정 대비 안전장치
+DISCORD_MAX_LEN = 2000  # 메시지 1건 최대 길이
+
+# ── SQL(자주 쓰는 문장) ─────────────────────────────────────────────────────
+# 문자열이 완전히 같아야 sqlite3 문장 캐시가 적중하므로 모든 호출부에서 상수를 공유
+INSERT_ALARM_SQL = """
+    INSERT INTO alarms (guild_id, channel_id, user_id, run_at_ts, message, sent)
+    VALUES (?, ?, ?, ?, ?, 0)
+"""
+INSERT_RECURRING_SQL = """
+    INSERT INTO recurring_alarms
+        (guild_id, channel_id, user_id, at_hour, at_minute, message, enabled, last_sent_local_date, ping_everyone)
+    VALUES (?, ?, ?, ?, ?, ?, 1, NULL, ?)
+"""
+MARK_RECURRING_SENT_SQL = """
+    UPDATE recurring_alarms
+    SET last_sent_local_date = ?
+    WHERE id = ?
+"""
+STATEMENT_CACHE_SIZE = 256  # sqlite3 기본값(128)보다 넉넉하게
+
+# ── 날짜 포맷(고정 형식 → strftime 대신 정수 포맷) ──────────────────────────
+def _fmt_date(dt: datetime) -> str:
+    """'YYYY-MM-DD'"""
+    return f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}"
+
+def _fmt_datetime(dt: datetime) -> str:
+    """'YYYY-MM-DD HH:MM:SS'"""
+    return f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d} {dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}"
+
 # ── 클라이언트 ──────────────────────────────────────────────────────────────
 class AlarmBot(discord.Client):
     def __init__(self):
         super().__init__(intents=INTENTS)
         self.tree = app_commands.CommandTree(self)
         self.db_path = os.getenv("DB_PATH", "alarms.sqlite3")
+        self.db: aiosqlite.Connection | None = None
+        self._wakeup = asyncio.Event()
+        self._scheduler_task: asyncio.Task | None = None
+        self._tick_lock = asyncio.Lock()  # check_alarms 동시 실행 방지
+        # 공유 커넥션의 쓰기(execute ~ commit)를 직렬화 → 핸들러/스케줄러 트랜잭션이 섞이지 않음
+        self.db_write_lock = asyncio.Lock()
+        # 오늘(TZ) 아직 안 보낸 반복 알람 중 가장 이른 시각(분). None = 다시 조회 필요
+        self._today: str | None = None
+        self._earliest_recurring_minute_today: int | None = None
 
     async def setup_hook(self):
         await self.tree.sync()
+        # 공유 커넥션 1개 유지(핸들러마다 재접속하지 않음 → 페이지 캐시 유지)
+        self.db = await aiosqlite.connect(self.db_path, cached_statements=STATEMENT_CACHE_SIZE)
         await self._init_db()
-        self.check_alarms.start()
+        self._scheduler_task = asyncio.create_task(self.run_scheduler())
+
+    async def close(self):
+        if self._scheduler_task is not None:
+            self._scheduler_task.cancel()
+            self._scheduler_task = None
+        await super().close()
+        if self.db is not None:
+            await self.db.close()
+            self.db = None
 
     async def _init_db(self):
-        async with aiosqlite.connect(self.db_path) as db:
-            # 일회성 알람
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS alarms (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    guild_id INTEGER,
-                    channel_id INTEGER,
-                    user_id INTEGER,
-                    run_at TEXT,          -- ISO8601(UTC)
-                    message TEXT,
-                    sent INTEGER DEFAULT 0
-                );
-            """)
-            # 반복 알람(매일 HH:MM)
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS recurring_alarms (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    guild_id INTEGER,
-                    channel_id INTEGER,
-                    user_id INTEGER,
-                    at_hour INTEGER,            -- 0~23
-                    at_minute INTEGER,          -- 0~59
-                    message TEXT,
-                    enabled INTEGER DEFAULT 1,
-                    last_sent_local_date TEXT   -- 'YYYY-MM-DD' (TZ 기준)
-                );
-            """)
-            # 마이그레이션: @everyone 사용 여부 컬럼
-            try:
-                await db.execute("ALTER TABLE recurring_alarms ADD COLUMN ping_everyone INTEGER DEFAULT 0;")
-            except Exception:
-                pass
-            await db.commit()
+        db = self.db
+        # 성능 설정: WAL(읽기/쓰기 동시 진행) + 커밋당 fsync 1회 감소
+        # journal_mode 는 트랜잭션 밖에서만 바뀌므로 DDL 보다 먼저 실행
+        await db.execute("PRAGMA journal_mode=WAL")
+        await db.execute("PRAGMA synchronous=NORMAL")
+        await db.execute("PRAGMA temp_store=MEMORY")
+        await db.execute("PRAGMA mmap_size=67108864")
+        await db.execute("PRAGMA cache_size=-64000")
+        # 일회성 알람
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS alarms (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                guild_id INTEGER,
+                channel_id INTEGER,
+                user_id INTEGER,
+                run_at TEXT,          -- ISO8601(UTC), 구버전 호환용(run_at_ts 사용)
+                message TEXT,
+                sent INTEGER DEFAULT 0
+            );
+        """)
+        # 반복 알람(매일 HH:MM)
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS recurring_alarms (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                guild_id INTEGER,
+                channel_id INTEGER,
+                user_id INTEGER,
+                at_hour INTEGER,            -- 0~23
+                at_minute INTEGER,          -- 0~59
+                message TEXT,
+                enabled INTEGER DEFAULT 1,
+                last_sent_local_date TEXT   -- 'YYYY-MM-DD' (TZ 기준)
+            );
+        """)
+        # 마이그레이션: 실행 시각을 정수(UTC epoch 초)로 저장 → 문자열 변환/파싱 제거
+        try:
+            await db.execute("ALTER TABLE alarms ADD COLUMN run_at_ts INTEGER;")
+        except Exception:
+            pass
+        await db.execute("""
+            UPDATE alarms SET run_at_ts = CAST(strftime('%s', run_at) AS INTEGER)
+            WHERE run_at_ts IS NULL AND run_at IS NOT NULL
+        """)
+        # run_at(TEXT) 기준 인덱스는 더 이상 쓰지 않음
+        await db.execute("DROP INDEX IF EXISTS idx_alarms_pending;")
+        await db.execute("DROP INDEX IF EXISTS idx_alarms_user;")
+        # 인덱스: 전송 대기 알람 조회(sent = 0 AND run_at_ts <= ?)
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_alarms_pending_ts ON alarms(sent, run_at_ts);")
+        # 인덱스: 사용자별 목록/취소(/alarms, /alarm_cancel)
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_alarms_user_ts ON alarms(user_id, guild_id, sent, run_at_ts);")
+        # 인덱스: 사용자별 매일 알람 목록/해제(/alarm_daily_list, /alarm_daily20_cancel)
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_recurring_user ON recurring_alarms(guild_id, user_id, at_hour, at_minute);")
+        # 인덱스: 활성 반복 알람 조회(check_alarms)
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_recurring_enabled ON recurring_alarms(enabled, at_hour, at_minute);")
+        # 마이그레이션: @everyone 사용 여부 컬럼
+        try:
+            await db.execute("ALTER TABLE recurring_alarms ADD COLUMN ping_everyone INTEGER DEFAULT 0;")
+        except Exception:
+            pass
+        await db.commit()
 
     # ── 전송 유틸: 채널 해소 & 안전 전송(재시도) ─────────────────────────────
     async def _resolve_channel(self, channel_id: int):
@@ -100,93 +182,214 @@ class AlarmBot(discord.Client):
                 else:
                     return False
 
-    # ── 알람 루프 ────────────────────────────────────────────────────────────
-    @tasks.loop(seconds=30)
-    async def check_alarms(self):
-        """일회성 + 반복 알람 전송 루프(30초 간격). 성공 시에만 완료 처리."""
-        now_utc = datetime.now(UTC)
-        now_local = now_utc.astimezone(TZ)
-        today_str = now_local.strftime("%Y-%m-%d")
+    async def _send_channel_batch(self, channel_id: int, items: list[tuple[int, str]]) -> list[int]:
+        """같은 채널의 알람들을 2000자 이내로 합쳐 전송. 전송에 성공한 알람 ID 목록을 반환."""
+        channel = await self._resolve_channel(channel_id)
+        if channel is None:
+            for rid, _ in items:
+                print(f"[WARN] 일회성 알람 #{rid}: 채널 {channel_id} 해소 실패 → 재시도 예정")
+            return []
+
+        # 순서를 유지하며 Discord 길이 제한 안에서 최대한 묶음
+        batches: list[tuple[list[int], str]] = []
+        for rid, text in items:
+            if batches and len(batches[-1][1]) + 1 + len(text) <= DISCORD_MAX_LEN:
+                ids, body = batches[-1]
+                ids.append(rid)
+                batches[-1] = (ids, f"{body}\n{text}")
+            else:
+                batches.append(([rid], text))
+
+        sent_ids = []
+        for ids, body in batches:
+            if await self._safe_send(channel, body):
+                sent_ids.extend(ids)
+            else:
+                # 실패 시 sent=0 유지 → 다음 루프에서 재시도
+                print(f"[INFO] 일회성 알람 {', '.join(f'#{rid}' for rid in ids)} 재시도 예정")
+        return sent_ids
+
+    # ── 알람 스케줄러 ────────────────────────────────────────────────────────
+    def wake_scheduler(self):
+        """새 알람 등록 시 호출 → 대기 중인 스케줄러를 깨워 다음 시각을 재계산."""
+        self._wakeup.set()
+
+    def reset_recurring_cache(self):
+        """반복 알람 등록 시 호출 → 오늘 가장 이른 반복 알람 시각을 다시 조회하게 함."""
+        self._earliest_recurring_minute_today = None
+
+    async def run_scheduler(self):
+        """다음 알람 시각까지 잠들었다가 깨어나 처리(고정 주기 폴링 대신)."""
+        await self.wait_until_ready()
+        while not self.is_closed():
+            self._wakeup.clear()
+            try:
+                # 처리/다음 시각 계산에 같은 기준 시각 사용 → 경계에 걸친 알람 누락 방지
+                now_utc = datetime.now(UTC)
+                retry = await self.check_alarms(now_utc)
+                delay = await self._next_delay(now_utc)
+                if retry:
+                    # 전송 실패 건이 남아 있음 → 늦어도 RETRY_DELAY 후 재시도
+                    delay = min(delay, RETRY_DELAY)
+            except Exception as e:
+                print(f"[ERROR] 알람 처리 중 예외: {e}")
+                delay = RETRY_DELAY
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
 
-        async with aiosqlite.connect(self.db_path) as db:
-            # ── 일회성 알람 처리 ─────────────────────────────────────────────
-            async with db.execute("""
-                SELECT id, guild_id, channel_id, user_id, run_at, message
+    async def _next_delay(self, now_utc: datetime) -> float:
+        """now_utc 이후 가장 가까운 일회성/반복 알람까지 남은 초."""
+        now_local = now_utc.astimezone(TZ)
+        today_str = _fmt_date(now_local)
+        db = self.db
+
+        # 반복 알람이 오늘 더 없으면 자정(TZ)에 깨어나 다음 날 기준으로 재계산
+        tomorrow = now_local.date() + timedelta(days=1)
+        next_dt = datetime.combine(tomorrow, datetime.min.time(), tzinfo=TZ)
+
+        rows = await db.execute_fetchall(
+            "SELECT MIN(run_at_ts) FROM alarms WHERE sent = 0 AND run_at_ts > ?",
+            (int(now_utc.timestamp()),),
+        )
+        if rows and rows[0][0] is not None:
+            next_dt = min(next_dt, datetime.fromtimestamp(rows[0][0], UTC))
+
+        rows = await db.execute_fetchall("""
+            SELECT MIN(at_hour * 60 + at_minute)
+            FROM recurring_alarms
+            WHERE enabled = 1
+              AND COALESCE(last_sent_local_date, '') <> ?
+              AND (at_hour * 60 + at_minute) > ?
+        """, (today_str, now_local.hour * 60 + now_local.minute))
+        if rows and rows[0][0] is not None:
+            h, m = divmod(rows[0][0], 60)
+            next_dt = min(next_dt, now_local.replace(hour=h, minute=m, second=0, microsecond=0))
+
+        delay = (next_dt - datetime.now(UTC)).total_seconds()
+        return min(max(delay, 0.0), MAX_SLEEP)
+
+    async def _send_recurring(self, rid: int, channel_id: int, user_id: int,
+                              at_hour: int, at_minute: int, message: str, ping_everyone: int) -> bool:
+        """반복 알람 1건 전송. 성공 여부를 반환."""
+        channel = await self._resolve_channel(channel_id)
+        if channel is None:
+            print(f"[WARN] 반복 알람 #{rid}: 채널 {channel_id} 해소 실패")
+            return False
+
+        if int(ping_everyone) == 1:
+            text = RECURRING_TEXT("@everyone", at_hour, at_minute, message)
+            allowed = ALLOWED_EVERYONE
+        else:
+            text = RECURRING_TEXT(f"<@{user_id}>", at_hour, at_minute, message)
+            allowed = ALLOWED_USER
+        return await self._safe_send(channel, text, allowed_mentions=allowed)
+
+    async def check_alarms(self, now_utc: datetime) -> bool:
+        """일회성 + 반복 알람 중 시각이 된 것을 전송. 성공 시에만 완료 처리.
+
+        조회 → (DB 밖에서) 전송 → 완료 처리 3단계로 나눠 Discord 지연 동안 트랜잭션을 잡지 않음.
+        전송 실패로 재시도가 필요한 알람이 남았으면 True 를 반환.
+        """
+        async with self._tick_lock:
+            now_local = now_utc.astimezone(TZ)
+            today_str = _fmt_date(now_local)
+            now_minute = now_local.hour * 60 + now_local.minute
+            db = self.db
+
+            # ── 1단계: 전송 대상 조회(읽기 전용 → 트랜잭션 불필요) ──────────
+            rows = await db.execute_fetchall("""
+                SELECT id, guild_id, channel_id, user_id, message
                 FROM alarms
-                WHERE sent = 0
-            """) as cursor:
-                rows = await cursor.fetchall()
-
-            for rid, guild_id, channel_id, user_id, run_at, message in rows:
-                run_dt = datetime.fromisoformat(run_at)
-                if run_dt.tzinfo is None:
-                    run_dt = run_dt.replace(tzinfo=UTC)
-                if run_dt > now_utc:
-                    continue
-
-                channel = await self._resolve_channel(channel_id)
-                sent_ok = False
-                if channel:
-                    try:
-                        content = f"<@{user_id}> 알람: {message}"
-                        sent_ok = await self._safe_send(channel, content)
-                    except Exception as e:
-                        print(f"[ERROR] 일회성 알람 #{rid} 전송 중 예외: {e}")
-                else:
-                    print(f"[WARN] 일회성 알람 #{rid}: 채널 {channel_id} 해소 실패")
+                WHERE sent = 0 AND run_at_ts <= ?
+            """, (int(now_utc.timestamp()),))
+
+            if today_str != self._today:
+                # 로컬 자정이 지나면 캐시 초기화
+                self._today = today_str
+                self._earliest_recurring_minute_today = None
+            if self._earliest_recurring_minute_today is None:
+                erows = await db.execute_fetchall("""
+                    SELECT MIN(at_hour * 60 + at_minute)
+                    FROM recurring_alarms
+                    WHERE enabled = 1 AND COALESCE(last_sent_local_date, '') <> ?
+                """, (today_str,))
+                earliest = erows[0][0] if erows else None
+                # 오늘 남은 반복 알람이 없으면 하루 끝(24:00)으로 두어 자정까지 조회 생략
+                self._earliest_recurring_minute_today = 24 * 60 if earliest is None else earliest
+
+            if now_minute < self._earliest_recurring_minute_today:
+                # 아직 어느 반복 알람도 시각이 되지 않음 → 조회 생략
+                rrows = []
+            else:
+                # 최대 지연 허용(루프 지터 보정): 목표 시각(분 단위)을 지났고 오늘 미발송이면 1회 발송
+                rrows = await db.execute_fetchall("""
+                    SELECT id, guild_id, channel_id, user_id, at_hour, at_minute, message,
+                           COALESCE(ping_everyone, 0)
+                    FROM recurring_alarms
+                    WHERE enabled = 1
+                      AND COALESCE(last_sent_local_date, '') <> ?
+                      AND (at_hour * 60 + at_minute) <= ?
+                """, (today_str, now_minute))
+
+            if not rows and not rrows:
+                return False
 
-                if sent_ok:
-                    await db.execute("UPDATE alarms SET sent = 1 WHERE id = ?", (rid,))
-                else:
-                    # 실패 시 sent=0 유지 → 다음 루프에서 재시도
-                    print(f"[INFO] 일회성 알람 #{rid} 재시도 예정")
-            await db.commit()
-
-            # ── 반복 알람(매일 HH:MM) 처리 ──────────────────────────────────
-            async with db.execute("""
-                SELECT id, guild_id, channel_id, user_id, at_hour, at_minute, message,
-                       enabled, COALESCE(last_sent_local_date, ''), COALESCE(ping_everyone, 0)
-                FROM recurring_alarms
-                WHERE enabled = 1
-            """) as rc:
-                rrows = await rc.fetchall()
-
-            for rid, guild_id, channel_id, user_id, at_hour, at_minute, message, enabled, last_sent, ping_everyone in rrows:
-                # 목표 시각(로컬) 계산
-                target_local = now_local.replace(hour=at_hour, minute=at_minute, second=0, microsecond=0)
-
-                # 최대 지연 허용(루프 지터 보정): 목표 시각을 지났다면 오늘 1회 발송
-                if last_sent == today_str or now_local < target_local:
+            # ── 2단계: 전송(DB 트랜잭션 없음) ──────────────────────────────
+            # 일회성: 채널별로 묶어 채널 간에는 동시에 전송(한 채널 실패가 다른 채널을 막지 않음)
+            grouped: dict[int, list[tuple[int, str]]] = {}
+            for rid, guild_id, channel_id, user_id, message in rows:
+                grouped.setdefault(channel_id, []).append((rid, f"<@{user_id}> 알람: {message}"))
+
+            results = await asyncio.gather(
+                *(self._send_channel_batch(cid, items) for cid, items in grouped.items()),
+                *(self._send_recurring(rid, channel_id, user_id, at_hour, at_minute, message, ping_everyone)
+                  for rid, guild_id, channel_id, user_id, at_hour, at_minute, message, ping_everyone in rrows),
+                return_exceptions=True,
+            )
+            once_results, recurring_results = results[:len(grouped)], results[len(grouped):]
+
+            sent_ids = []
+            for channel_id, result in zip(grouped, once_results):
+                if isinstance(result, BaseException):
+                    print(f"[ERROR] 채널 {channel_id} 일회성 알람 전송 중 예외: {result}")
                     continue
+                sent_ids.extend(result)
 
-                channel = await self._resolve_channel(channel_id)
-                sent_ok = False
-                if channel:
-                    if int(ping_everyone) == 1:
-                        text = f"@everyone 알람(매일 {at_hour:02d}:{at_minute:02d}) : {message}"
-                        allowed = discord.AllowedMentions(everyone=True, users=False, roles=False)
-                    else:
-                        text = f"<@{user_id}> 알람(매일 {at_hour:02d}:{at_minute:02d}) : {message}"
-                        allowed = discord.AllowedMentions(everyone=False, users=True, roles=False)
-
-                    sent_ok = await self._safe_send(channel, text, allowed_mentions=allowed)
-                else:
-                    print(f"[WARN] 반복 알람 #{rid}: 채널 {channel_id} 해소 실패")
-
-                if sent_ok:
-                    await db.execute("""
-                        UPDATE recurring_alarms
-                        SET last_sent_local_date = ?
-                        WHERE id = ?
-                    """, (today_str, rid))
+            sent_pairs = []
+            for row, result in zip(rrows, recurring_results):
+                rid = row[0]
+                if isinstance(result, BaseException):
+                    print(f"[ERROR] 반복 알람 #{rid} 전송 중 예외: {result}")
+                    continue
+                if result is True:
+                    sent_pairs.append((today_str, rid))
                 else:
                     # 실패 시 날짜 갱신 안 함 → 같은 날 계속 재시도
                     print(f"[INFO] 반복 알람 #{rid} 전송 실패 → 오늘 재시도")
-            await db.commit()
 
-    @check_alarms.before_loop
-    async def before_check(self):
-        await self.wait_until_ready()
+            # ── 3단계: 성공한 알람만 완료 처리(짧은 쓰기 트랜잭션 1개) ────────
+            if sent_ids or sent_pairs:
+                # 쓰기 락 안에서 첫 UPDATE 가 트랜잭션을 열고 commit 으로 닫음(전송 중에는 열지 않음)
+                async with self.db_write_lock:
+                    try:
+                        if sent_ids:
+                            await db.execute(
+                                f"UPDATE alarms SET sent = 1 WHERE id IN ({','.join('?' * len(sent_ids))})",
+                                sent_ids,
+                            )
+                        if sent_pairs:
+                            await db.executemany(MARK_RECURRING_SENT_SQL, sent_pairs)
+                    except Exception:
+                        await db.rollback()
+                        raise
+                    await db.commit()
+                if sent_pairs:
+                    # 보낸 알람이 빠졌으니 다음 틱에 가장 이른 시각을 다시 조회
+                    self._earliest_recurring_minute_today = None
+
+            return len(sent_ids) < len(rows) or len(sent_pairs) < len(rrows)
 
 # ── 인스턴스 ────────────────────────────────────────────────────────────────
 client = AlarmBot()
@@ -205,17 +408,15 @@ async def alarm_in(interaction: discord.Interaction, minutes: int, message: str)
         return
 
     run_local = datetime.now(TZ) + timedelta(minutes=minutes)
-    run_utc = run_local.astimezone(UTC)
 
-    async with aiosqlite.connect(client.db_path) as db:
-        await db.execute("""
-            INSERT INTO alarms (guild_id, channel_id, user_id, run_at, message, sent)
-            VALUES (?, ?, ?, ?, ?, 0)
-        """, (interaction.guild_id, interaction.channel_id, interaction.user.id, run_utc.isoformat(), message))
+    db = client.db
+    async with client.db_write_lock:
+        await db.execute(INSERT_ALARM_SQL, (interaction.guild_id, interaction.channel_id, interaction.user.id, int(run_local.timestamp()), message))
         await db.commit()
+    client.wake_scheduler()
 
     await interaction.response.send_message(
-        f"알람 등록 완료: **{run_local.strftime('%Y-%m-%d %H:%M:%S')} (Asia/Seoul)** 에 알림을 보냅니다.",
+        f"알람 등록 완료: **{_fmt_datetime(run_local)} (Asia/Seoul)** 에 알림을 보냅니다.",
         ephemeral=True
     )
 
@@ -233,41 +434,35 @@ async def alarm_at(interaction: discord.Interaction, when: str, message: str):
         await interaction.response.send_message("과거 시각은 등록할 수 없습니다.", ephemeral=True)
         return
 
-    run_utc = run_local.astimezone(UTC)
-    async with aiosqlite.connect(client.db_path) as db:
-        await db.execute("""
-            INSERT INTO alarms (guild_id, channel_id, user_id, run_at, message, sent)
-            VALUES (?, ?, ?, ?, ?, 0)
-        """, (interaction.guild_id, interaction.channel_id, interaction.user.id, run_utc.isoformat(), message))
+    db = client.db
+    async with client.db_write_lock:
+        await db.execute(INSERT_ALARM_SQL, (interaction.guild_id, interaction.channel_id, interaction.user.id, int(run_local.timestamp()), message))
         await db.commit()
+    client.wake_scheduler()
 
     await interaction.response.send_message(
-        f"알람 등록 완료: **{run_local.strftime('%Y-%m-%d %H:%M:%S')} (Asia/Seoul)** 에 알림을 보냅니다.",
+        f"알람 등록 완료: **{_fmt_datetime(run_local)} (Asia/Seoul)** 에 알림을 보냅니다.",
         ephemeral=True
     )
 
 # ── 명령어: 일회성 알람 목록 ───────────────────────────────────────────────
 @client.tree.command(name="alarms", description="내가 등록한 대기 중 알람을 조회합니다.")
 async def alarms(interaction: discord.Interaction):
-    async with aiosqlite.connect(client.db_path) as db:
-        async with db.execute("""
-            SELECT id, run_at, message FROM alarms
-            WHERE sent = 0 AND user_id = ? AND guild_id = ?
-            ORDER BY run_at ASC
-        """, (interaction.user.id, interaction.guild_id)) as cursor:
-            rows = await cursor.fetchall()
+    db = client.db
+    rows = await db.execute_fetchall("""
+        SELECT id, run_at_ts, message FROM alarms
+        WHERE sent = 0 AND user_id = ? AND guild_id = ?
+        ORDER BY run_at_ts ASC
+    """, (interaction.user.id, interaction.guild_id))
 
     if not rows:
         await interaction.response.send_message("대기 중 알람이 없습니다.", ephemeral=True)
         return
 
-    lines = []
-    for rid, run_at, message in rows:
-        run_dt = datetime.fromisoformat(run_at)
-        if run_dt.tzinfo is None:
-            run_dt = run_dt.replace(tzinfo=UTC)
-        run_local = run_dt.astimezone(TZ)
-        lines.append(f"`#{rid}`  {run_local.strftime('%Y-%m-%d %H:%M:%S')}  - {message}")
+    lines = [
+        f"`#{rid}`  {_fmt_datetime(datetime.fromtimestamp(run_at_ts, TZ))}  - {message}"
+        for rid, run_at_ts, message in rows
+    ]
 
     await interaction.response.send_message("**등록된 알람**\n" + "\n".join(lines), ephemeral=True)
 
@@ -275,12 +470,14 @@ async def alarms(interaction: discord.Interaction):
 @client.tree.command(name="alarm_cancel", description="알람 ID로 취소합니다. /alarms로 ID 확인")
 @app_commands.describe(alarm_id="취소할 알람의 ID")
 async def alarm_cancel(interaction: discord.Interaction, alarm_id: int):
-    async with aiosqlite.connect(client.db_path) as db:
-        await db.execute("""
+    db = client.db
+    async with client.db_write_lock:
+        cur = await db.execute("""
             DELETE FROM alarms
             WHERE id = ? AND user_id = ? AND guild_id = ? AND sent = 0
         """, (alarm_id, interaction.user.id, interaction.guild_id))
-        changes = db.total_changes
+        changes = cur.rowcount
+        await cur.close()
         await db.commit()
 
     if changes == 0:
@@ -292,13 +489,12 @@ async def alarm_cancel(interaction: discord.Interaction, alarm_id: int):
 @client.tree.command(name="alarm_daily20", description="매일 20:00(Asia/Seoul) 알람을 현재 채널에 등록합니다.")
 @app_commands.describe(message="알람 메시지")
 async def alarm_daily20(interaction: discord.Interaction, message: str):
-    async with aiosqlite.connect(client.db_path) as db:
-        await db.execute("""
-            INSERT INTO recurring_alarms
-                (guild_id, channel_id, user_id, at_hour, at_minute, message, enabled, last_sent_local_date, ping_everyone)
-            VALUES (?, ?, ?, 20, 0, ?, 1, NULL, 0)
-        """, (interaction.guild_id, interaction.channel_id, interaction.user.id, message))
+    db = client.db
+    async with client.db_write_lock:
+        await db.execute(INSERT_RECURRING_SQL, (interaction.guild_id, interaction.channel_id, interaction.user.id, 20, 0, message, 0))
         await db.commit()
+    client.reset_recurring_cache()
+    client.wake_scheduler()
     await interaction.response.send_message("매일 **20:00 (Asia/Seoul)** 알람을 등록했습니다.", ephemeral=True)
 
 # ── 명령어: 매일 20:00(@everyone) ─────────────────────────────────────────
@@ -313,13 +509,12 @@ async def alarm_daily20_everyone(interaction: discord.Interaction, message: str)
         await interaction.response.send_message("이 채널에서 봇에게 `@everyone` 언급 권한이 없습니다.", ephemeral=True)
         return
 
-    async with aiosqlite.connect(client.db_path) as db:
-        await db.execute("""
-            INSERT INTO recurring_alarms
-                (guild_id, channel_id, user_id, at_hour, at_minute, message, enabled, last_sent_local_date, ping_everyone)
-            VALUES (?, ?, ?, 20, 0, ?, 1, NULL, 1)
-        """, (interaction.guild_id, interaction.channel_id, interaction.user.id, message))
+    db = client.db
+    async with client.db_write_lock:
+        await db.execute(INSERT_RECURRING_SQL, (interaction.guild_id, interaction.channel_id, interaction.user.id, 20, 0, message, 1))
         await db.commit()
+    client.reset_recurring_cache()
+    client.wake_scheduler()
     await interaction.response.send_message("매일 **20:00** `@everyone` 알람을 등록했습니다.", ephemeral=True)
 
 # ── 명령어: 매일 N시 M분 @everyone(커스텀 시각) ───────────────────────────
@@ -342,13 +537,12 @@ async def alarm_daily_everyone(interaction: discord.Interaction, time: str, mess
         await interaction.response.send_message("시간 형식이 올바르지 않습니다. 예: 08:30 또는 23:00", ephemeral=True)
         return
 
-    async with aiosqlite.connect(client.db_path) as db:
-        await db.execute("""
-            INSERT INTO recurring_alarms
-                (guild_id, channel_id, user_id, at_hour, at_minute, message, enabled, last_sent_local_date, ping_everyone)
-            VALUES (?, ?, ?, ?, ?, ?, 1, NULL, 1)
-        """, (interaction.guild_id, interaction.channel_id, interaction.user.id, hour, minute, message))
+    db = client.db
+    async with client.db_write_lock:
+        await db.execute(INSERT_RECURRING_SQL, (interaction.guild_id, interaction.channel_id, interaction.user.id, hour, minute, message, 1))
         await db.commit()
+    client.reset_recurring_cache()
+    client.wake_scheduler()
 
     await interaction.response.send_message(
         f"매일 **{hour:02d}:{minute:02d} (Asia/Seoul)** `@everyone` 알람을 등록했습니다.",
@@ -358,13 +552,15 @@ async def alarm_daily_everyone(interaction: discord.Interaction, time: str, mess
 # ── 명령어: 매일 알람 해제(20:00 고정) ────────────────────────────────────
 @client.tree.command(name="alarm_daily20_cancel", description="매일 20:00(Asia/Seoul) 알람을 해제합니다.")
 async def alarm_daily20_cancel(interaction: discord.Interaction):
-    async with aiosqlite.connect(client.db_path) as db:
-        await db.execute("""
+    db = client.db
+    async with client.db_write_lock:
+        cur = await db.execute("""
             UPDATE recurring_alarms
             SET enabled = 0
             WHERE guild_id = ? AND channel_id = ? AND user_id = ? AND at_hour = 20 AND at_minute = 0 AND enabled = 1
         """, (interaction.guild_id, interaction.channel_id, interaction.user.id))
-        changes = db.total_changes
+        changes = cur.rowcount
+        await cur.close()
         await db.commit()
 
     if changes == 0:
@@ -375,25 +571,24 @@ async def alarm_daily20_cancel(interaction: discord.Interaction):
 # ── 명령어: 매일 알람 목록 ────────────────────────────────────────────────
 @client.tree.command(name="alarm_daily_list", description="내가 등록한 매일 알람을 확인합니다.")
 async def alarm_daily_list(interaction: discord.Interaction):
-    async with aiosqlite.connect(client.db_path) as db:
-        async with db.execute("""
-            SELECT id, at_hour, at_minute, message, enabled,
-                   COALESCE(last_sent_local_date,''), COALESCE(ping_everyone,0)
-            FROM recurring_alarms
-            WHERE guild_id = ? AND user_id = ?
-            ORDER BY at_hour, at_minute, id
-        """, (interaction.guild_id, interaction.user.id)) as c:
-            rows = await c.fetchall()
+    db = client.db
+    rows = await db.execute_fetchall("""
+        SELECT id, at_hour, at_minute, message, enabled,
+               COALESCE(last_sent_local_date,''), COALESCE(ping_everyone,0)
+        FROM recurring_alarms
+        WHERE guild_id = ? AND user_id = ?
+        ORDER BY at_hour, at_minute, id
+    """, (interaction.guild_id, interaction.user.id))
 
     if not rows:
         await interaction.response.send_message("등록된 매일 알람이 없습니다.", ephemeral=True)
         return
 
-    lines = []
-    for rid, h, m, msg, enabled, last_sent, ping_everyone in rows:
-        status = "ON" if enabled else "OFF"
-        tag = "@everyone" if int(ping_everyone) == 1 else ""
-        lines.append(f"`#{rid}` {h:02d}:{m:02d} [{status}] {tag} - {msg} (last_sent={last_sent or '-'})")
+    lines = [
+        f"`#{rid}` {h:02d}:{m:02d} [{'ON' if enabled else 'OFF'}] {'@everyone' if int(ping_everyone) == 1 else ''}"
+        f" - {msg} (last_sent={last_sent or '-'})"
+        for rid, h, m, msg, enabled, last_sent, ping_everyone in rows
+    ]
 
     await interaction.response.send_message("**매일 알람 목록**\n" + "\n".join(lines), ephemeral=True)
 
@@ -404,13 +599,15 @@ async def alarm_daily_list(interaction: discord.Interaction):
 )
 @app_commands.describe(alarm_id="취소할 매일 알람의 ID")
 async def alarm_daily_cancel(interaction: discord.Interaction, alarm_id: int):
-    async with aiosqlite.connect(client.db_path) as db:
-        await db.execute("""
+    db = client.db
+    async with client.db_write_lock:
+        cur = await db.execute("""
             UPDATE recurring_alarms
             SET enabled = 0
             WHERE id = ? AND user_id = ? AND guild_id = ? AND enabled = 1
         """, (alarm_id, interaction.user.id, interaction.guild_id))
-        changes = db.total_changes
+        changes = cur.rowcount
+        await cur.close()
         await db.commit()
 
     if changes == 0: